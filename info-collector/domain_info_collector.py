@@ -1,20 +1,172 @@
+import asyncio
 import csv
+import re
 import whois # For WHOIS lookups
-import dns.resolver # For DNS lookups (MX, A/AAAA records)
-import time
+import dns.asyncresolver # For DNS lookups (MX, A/AAAA records)
+import dns.resolver # For DNS exception types
 import socket # For potential socket errors
 
-def get_domain_info(domain_name):
+try:
+    import uvloop # Optional: faster event loop for many concurrent DNS queries
+except ImportError:
+    uvloop = None
+
+# --- Configuration ---
+# Lookups run as a two-stage pipeline: DNS for many domains at once, then WHOIS in a
+# smaller pool, so slow WHOIS sessions never stall DNS. Be respectful to servers:
+# lower these if you start hitting rate limits.
+# Each domain's DNS stage sends 3 queries to every raced nameserver (see
+# PUBLIC_NAMESERVERS), so keep DNS_CONCURRENCY well below your open-file limit.
+DNS_CONCURRENCY = 64
+# WHOIS lookups open a TCP session to the registrar's server, so they get far fewer workers.
+WHOIS_CONCURRENCY = 16
+# Domains with DNS done that are waiting for a WHOIS worker. When the queue is full
+# the DNS stage pauses until WHOIS catches up.
+DNS_QUEUE_SIZE = 64
+# Politeness towards each WHOIS server: at most this many sessions at once, with
+# their starts at least WHOIS_MIN_INTERVAL seconds apart. Unrelated servers don't
+# share these limits, so they proceed in parallel.
+WHOIS_PER_SERVER_CONCURRENCY = 2
+WHOIS_MIN_INTERVAL = 0.5
+# DNS timeout in seconds, passed per query so the shared resolver is never mutated.
+DNS_LIFETIME = 3
+# Finished rows are written to the output file in batches of this size.
+WRITE_CHUNK_SIZE = 256
+
+class ServerLimiter:
     """
-    Gathers WHOIS, DNS (A/AAAA, MX) information for a given domain.
-    Returns a formatted string with all information.
+    Async context manager limiting requests to a single server: at most
+    `concurrency` in flight, with starts spaced `min_interval` seconds apart.
+    """
+
+    def __init__(self, concurrency, min_interval):
+        self._sem = asyncio.Semaphore(concurrency)
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._sem.acquire()
+        try:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._min_interval
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._sem.release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._sem.release()
+
+
+# One limiter per WHOIS server. The registry's WHOIS server is picked by TLD,
+# so the TLD is used as the key.
+_WHOIS_LIMITERS = {}
+
+
+def whois_limiter(domain_name):
+    tld = domain_name.rsplit('.', 1)[-1]
+    return _WHOIS_LIMITERS.setdefault(tld, ServerLimiter(WHOIS_PER_SERVER_CONCURRENCY, WHOIS_MIN_INTERVAL))
+
+
+# Hostname syntax (RFC 1035): at least two dot-separated labels of 1-63 letters,
+# digits or hyphens, no label starting or ending with a hyphen, 253 characters max.
+# Matched against the IDNA (punycode) form, so internationalized names pass too.
+_DOMAIN_RE = re.compile(r'^(?=.{1,253}$)(?!-)[A-Za-z0-9-]{1,63}(?<!-)(?:\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))+$')
+
+# WHOIS contact fields to report: contact type -> (label, attribute names tried in order).
+# You might want to add more specific fields if `python-whois` consistently parses them
+# for your target domains, e.g. street, city, country, phone.
+_CONTACT_FIELDS = {
+    'registrant': (
+        ('Name', ('registrant_name', 'name')),
+        ('Organization', ('registrant_organization', 'org')),
+        ('Email', ('registrant_email',)),
+    ),
+    'admin': (
+        ('Name', ('admin_name',)),
+        ('Organization', ('admin_organization', 'admin_org')),
+        ('Email', ('admin_email',)),
+    ),
+    'tech': (
+        ('Name', ('tech_name',)),
+        ('Organization', ('tech_organization', 'tech_org')),
+        ('Email', ('tech_email',)),
+    ),
+}
+
+# Public resolvers queried alongside the system ones; the first reply wins, so one
+# slow or lossy nameserver no longer sets the pace for every lookup.
+PUBLIC_NAMESERVERS = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
+
+
+def _retrieve_exception(task):
+    # Mark a losing task's error as seen, so asyncio doesn't log it as never retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+class RacingResolver:
+    """
+    Sends each query to every nameserver at once and returns the first reply.
+    NXDOMAIN and NoAnswer count as replies; timeouts and server failures only
+    surface if no nameserver answers. resolve() takes the same arguments as
+    dns.asyncresolver.Resolver.resolve().
+    """
+
+    def __init__(self, nameservers, cache=None):
+        self._resolvers = []
+        for nameserver in nameservers:
+            resolver = dns.asyncresolver.Resolver(configure=False)
+            resolver.nameservers = [nameserver]
+            resolver.cache = cache # Shared, so any nameserver's answer serves later queries
+            resolver.retry_servfail = False # A broken server fails fast; the others are still racing
+            self._resolvers.append(resolver)
+
+    async def resolve(self, qname, rdtype=dns.rdatatype.A, **kwargs):
+        pending = {asyncio.ensure_future(resolver.resolve(qname, rdtype, **kwargs))
+                   for resolver in self._resolvers}
+        for task in pending:
+            task.add_done_callback(_retrieve_exception)
+        first_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+                        raise error
+                    first_error = first_error or error
+            raise first_error or dns.resolver.NoNameservers()
+        finally:
+            for task in pending: # Losers are no longer needed
+                task.cancel()
+
+
+# One resolver for the whole run; /etc/resolv.conf is only parsed once.
+# Its cache also remembers NXDOMAIN answers.
+_RESOLVER = RacingResolver(
+    list(dict.fromkeys(PUBLIC_NAMESERVERS + dns.asyncresolver.Resolver().nameservers)),
+    cache=dns.resolver.LRUCache(max_size=20000),
+)
+
+
+async def lookup_whois_async(domain_name):
+    """
+    Gathers WHOIS information for a given domain. The blocking WHOIS query runs
+    in a worker thread, guarded by the per-server limiter for the domain's TLD.
+    Returns (info_parts, errors) lists of strings.
     """
     info_parts = []
     errors = []
 
     # --- WHOIS Lookup ---
     try:
-        w = whois.whois(domain_name)
+        async with whois_limiter(domain_name):
+            w = await asyncio.to_thread(whois.whois, domain_name)
         if w:
             if w.domain_name: # Check if WHOIS lookup was successful at all
                 info_parts.append(f"Domain Name: {w.domain_name if isinstance(w.domain_name, str) else ', '.join(w.domain_name)}")
@@ -60,18 +212,12 @@ def get_domain_info(domain_name):
                 # The python-whois library provides what it can parse.
                 # Detailed street/city breakdown like your example is highly registrar-dependent
                 # and often not available as separate attributes.
-                for contact_type_prefix in ['registrant', 'admin', 'tech']:
-                    name = getattr(w, f"{contact_type_prefix}_name", None) or getattr(w, "name", None) if contact_type_prefix == 'registrant' else getattr(w, f"{contact_type_prefix}_name", None)
-                    org = getattr(w, f"{contact_type_prefix}_organization", None) or getattr(w, "org", None) if contact_type_prefix == 'registrant' else getattr(w, f"{contact_type_prefix}_organization", None)
-                    email = getattr(w, f"{contact_type_prefix}_email", None)
-                    # Address details are usually in w.address, w.city etc. if parsed, or part of raw text
-                    
-                    # For simplicity, we'll report common fields if available
-                    if name: info_parts.append(f"{contact_type_prefix.capitalize()} Name: {name}")
-                    if org: info_parts.append(f"{contact_type_prefix.capitalize()} Organization: {org}")
-                    # You might want to add more specific fields if `python-whois` consistently parses them for your target domains
-                    # e.g. street, city, country, phone
-                    if email: info_parts.append(f"{contact_type_prefix.capitalize()} Email: {email}")
+                # Address details are usually in w.address, w.city etc. if parsed, or part of raw text.
+                # For simplicity, we'll report the common fields listed in _CONTACT_FIELDS if available.
+                for contact_type_prefix, fields in _CONTACT_FIELDS.items():
+                    for label, attr_names in fields:
+                        value = next((v for v in (getattr(w, n, None) for n in attr_names) if v), None)
+                        if value: info_parts.append(f"{contact_type_prefix.capitalize()} {label}: {value}")
 
 
                 if w.name_servers:
@@ -97,18 +243,36 @@ def get_domain_info(domain_name):
         info_parts.append(f"WHOIS General Error: {e}")
         errors.append(f"General WHOIS processing error for {domain_name}: {e}")
 
+    return info_parts, errors
+
+
+async def lookup_dns_async(domain_name, resolver):
+    """
+    Gathers DNS (A/AAAA, MX) information for a given domain.
+    Returns (info_parts, errors) lists of strings.
+    """
+    info_parts = []
+    errors = []
+
     # --- DNS Lookups ---
-    resolver = dns.resolver.Resolver()
-    resolver.timeout = 3
-    resolver.lifetime = 3
+    # search=False: names are queried exactly as given, never with resolv.conf search suffixes.
+    # All record types are queried at once; each block below reads its own results.
+    # Failed queries come back as exception objects and are re-raised in their block.
+    a_result, aaaa_result, mx_result = await asyncio.gather(
+        *(resolver.resolve(domain_name, rdtype, lifetime=DNS_LIFETIME, search=False)
+          for rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA, dns.rdatatype.MX)),
+        return_exceptions=True,
+    )
 
     # A/AAAA Records (IP Addresses)
     ip_addresses = []
     try:
-        for rdtype in [dns.rdatatype.A, dns.rdatatype.AAAA]:
-            answers = resolver.resolve(domain_name, rdtype)
-            for rdata in answers:
-                ip_addresses.append(rdata.to_text())
+        # A missing AAAA record must not hide the A answer
+        for result in (a_result, aaaa_result):
+            if not isinstance(result, Exception):
+                ip_addresses.extend(rdata.to_text() for rdata in result)
+        if not ip_addresses and isinstance(a_result, Exception):
+            raise a_result
         info_parts.append(f"Server IP (A/AAAA): {', '.join(ip_addresses) if ip_addresses else 'No A/AAAA record found'}")
     except dns.resolver.NXDOMAIN:
         info_parts.append("Server IP (A/AAAA): NXDOMAIN (Domain does not exist)")
@@ -126,8 +290,9 @@ def get_domain_info(domain_name):
     # MX Records (Mail Servers)
     mail_servers = []
     try:
-        answers = resolver.resolve(domain_name, dns.rdatatype.MX)
-        for rdata in answers:
+        if isinstance(mx_result, Exception):
+            raise mx_result
+        for rdata in mx_result:
             mail_servers.append(f"{rdata.preference} {rdata.exchange.to_text()}")
         info_parts.append(f"Mail Server (MX): {', '.join(mail_servers) if mail_servers else 'No MX record found'}")
     except dns.resolver.NXDOMAIN:
@@ -142,7 +307,14 @@ def get_domain_info(domain_name):
     except Exception as e:
         info_parts.append(f"Mail Server (MX) Error: {e}")
         errors.append(f"DNS MX lookup error for {domain_name}: {e}")
-    
+
+    return info_parts, errors
+
+
+def format_domain_info(info_parts, errors):
+    """
+    Returns a formatted string with all information gathered for a domain.
+    """
     if not info_parts and errors: # If only errors occurred
         return "Error gathering information:\n" + "\n".join(errors)
     elif errors: # If some info and some errors
@@ -151,56 +323,101 @@ def get_domain_info(domain_name):
     return "\n".join(info_parts)
 
 
-def process_csv_files(input_filepath, output_filepath):
+async def process_csv_files(input_filepath, output_filepath):
     """
-    Reads domains from input_filepath, gathers info, and writes to output_filepath.
+    Reads domains from input_filepath, gathers info concurrently, and writes to output_filepath.
+    DNS lookups feed a queue that a smaller pool of WHOIS workers drains; results are
+    written in the same order as the input rows.
     """
     try:
-        with open(input_filepath, 'r', newline='', encoding='utf-8') as infile, \
-             open(output_filepath, 'w', newline='', encoding='utf-8') as outfile:
-            
-            reader = csv.reader(infile)
-            writer = csv.writer(outfile)
-            
-            writer.writerow(['Domain', 'Information']) # Write header
-            
-            print(f"Starting to process domains from: {input_filepath}")
-            print(f"Results will be saved to: {output_filepath}")
-
-            for i, row in enumerate(reader):
-                if not row:  # Skip empty rows
-                    print(f"Skipping empty row {i+1}.")
-                    continue
-                
-                domain_name = row[0].strip().lower() # Assuming domain is in the first column
-                
-                if not domain_name:
-                    print(f"Skipping empty domain name in row {i+1}.")
-                    writer.writerow(["EMPTY_ROW", "No domain provided in this row."])
-                    continue
-
-                # Basic validation (can be improved)
-                if '.' not in domain_name or ' ' in domain_name or len(domain_name) > 253:
-                    print(f"Skipping invalid domain format in row {i+1}: '{domain_name}'")
-                    writer.writerow([domain_name, "Invalid domain format"])
-                    continue
-                
+        with open(input_filepath, 'r', newline='', encoding='utf-8') as infile:
+            rows = list(csv.reader(infile))
+
+        print(f"Starting to process domains from: {input_filepath}")
+        print(f"Results will be saved to: {output_filepath}")
+
+        loop = asyncio.get_running_loop()
+        dns_sem = asyncio.Semaphore(DNS_CONCURRENCY)
+        dns_queue = asyncio.Queue(maxsize=DNS_QUEUE_SIZE)
+
+        async def dns_stage(i, domain_name, row_future):
+            # The DNS slot is held until the result is queued, so a full queue pauses this stage
+            async with dns_sem:
                 print(f"Processing ({i+1}): {domain_name}...")
-                
                 try:
-                    domain_information = get_domain_info(domain_name)
-                    writer.writerow([domain_name, domain_information])
+                    dns_result = await lookup_dns_async(domain_name, _RESOLVER)
+                except Exception as e:
+                    dns_result = e
+                await dns_queue.put((domain_name, dns_result, row_future))
+
+        async def whois_worker():
+            while True:
+                domain_name, dns_result, row_future = await dns_queue.get()
+                try:
+                    if isinstance(dns_result, Exception):
+                        raise dns_result
+                    whois_parts, whois_errors = await lookup_whois_async(domain_name)
+                    dns_parts, dns_errors = dns_result
+                    domain_information = format_domain_info(whois_parts + dns_parts, whois_errors + dns_errors)
                     print(f"Finished: {domain_name}")
                 except Exception as e:
-                    # This is a catch-all for unexpected errors during get_domain_info call itself
+                    # This is a catch-all for unexpected errors in either stage
                     print(f"Critical error processing {domain_name}: {e}")
-                    writer.writerow([domain_name, f"Critical error during processing for {domain_name}: {e}"])
-                
-                # Be respectful to servers: add a delay
-                # Adjust sleep time as needed. 0.5 to 1 second is usually a good start.
-                time.sleep(0.75) 
+                    domain_information = f"Critical error during processing for {domain_name}: {e}"
+                row_future.set_result([domain_name, domain_information])
+
+        # Ready-made rows for skipped input, and futures that resolve to rows, in input order
+        output_rows = []
+        dns_tasks = [] # Keeps the DNS stage tasks referenced until they finish
+
+        for i, row in enumerate(rows):
+            if not row:  # Skip empty rows
+                print(f"Skipping empty row {i+1}.")
+                continue
+
+            domain_name = row[0].strip().lower() # Assuming domain is in the first column
+
+            if not domain_name:
+                print(f"Skipping empty domain name in row {i+1}.")
+                output_rows.append(["EMPTY_ROW", "No domain provided in this row."])
+                continue
+
+            # Reject malformed names up front rather than waiting on DNS/WHOIS timeouts.
+            # A trailing dot (fully-qualified name) is fine; IDN labels are checked in punycode.
+            try:
+                ascii_name = domain_name.rstrip('.').encode('idna').decode('ascii')
+            except UnicodeError:
+                ascii_name = None
+            if not ascii_name or not _DOMAIN_RE.match(ascii_name):
+                print(f"Skipping invalid domain format in row {i+1}: '{domain_name}'")
+                output_rows.append([domain_name, "Invalid domain format"])
+                continue
+            # python-whois and the per-server limiters can't handle a trailing dot; DNS doesn't need it
+            domain_name = domain_name.rstrip('.')
+
+            row_future = loop.create_future()
+            output_rows.append(row_future)
+            dns_tasks.append(asyncio.ensure_future(dns_stage(i, domain_name, row_future)))
+
+        whois_workers = [asyncio.ensure_future(whois_worker()) for _ in range(WHOIS_CONCURRENCY)]
+
+        with open(output_filepath, 'w', buffering=1 << 20, newline='', encoding='utf-8') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(['Domain', 'Information']) # Write header
+
+            # Rows are written in input order, in chunks, as soon as every row before them is done
+            chunk = []
+            for entry in output_rows:
+                chunk.append(await entry if isinstance(entry, asyncio.Future) else entry)
+                if len(chunk) >= WRITE_CHUNK_SIZE:
+                    writer.writerows(chunk)
+                    chunk.clear()
+            writer.writerows(chunk)
+
+        for task in whois_workers: # Every row is written, so the workers are idle
+            task.cancel()
 
-            print("\nProcessing complete.")
+        print("\nProcessing complete.")
 
     except FileNotFoundError:
         print(f"Error: Input file '{input_filepath}' not found.")
@@ -211,7 +428,10 @@ if __name__ == "__main__":
     input_csv = input("Enter the path to your input CSV file (e.g., domains.csv): ")
     output_csv = input("Enter the desired path for your output CSV file (e.g., domain_details.csv): ")
 
-    process_csv_files(input_csv, output_csv)
+    if uvloop is not None:
+        uvloop.run(process_csv_files(input_csv, output_csv))
+    else:
+        asyncio.run(process_csv_files(input_csv, output_csv))
 
     print(f"""
     --------------------------------------------------------------------
@@ -229,9 +449,10 @@ if __name__ == "__main__":
        Your example output for lvt.com is quite detailed, likely due to a specific registrar's
        WHOIS format; universal parsing of such detail is complex.
     4. Rate Limiting: Performing many queries quickly can lead to temporary blocks by
-       WHOIS or DNS servers. The script includes a small delay. If you process many domains,
-       you might need to increase this delay or handle rate-limiting errors more robustly.
+       WHOIS or DNS servers. The script caps how many lookups run at once. If you process
+       many domains, you might need to lower DNS_CONCURRENCY / WHOIS_CONCURRENCY.
     5. Library Installation: Ensure you have installed the required libraries:
        `pip install python-whois dnspython`
+       Optionally `pip install uvloop` (Linux/macOS) for a faster event loop.
     --------------------------------------------------------------------
     """)
\ No newline at end of file
@@ -1,4 +1,13 @@
+import argparse
+import atexit
+import concurrent.futures
 import csv
+import functools
+import json
+import shelve # For the on-disk WHOIS cache
+import sqlite3 # For the on-disk DNS cache
+import threading
+from dataclasses import dataclass
 import whois # For WHOIS lookups
 import dns.resolver # For DNS lookups
 import tldextract # For accurately extracting base domain names
@@ -16,8 +25,219 @@ TLDS_TO_CHECK = [
     '.de', '.fr', '.au', '.nl', '.ru', '.cn', '.br', '.in', '.jp', # Common ccTLDs
     '.live', '.shop', '.world', '.guru', '.news', '.today', '.ltd', '.group'
 ]
-# Ensure unique and sorted TLDs, all starting with a dot.
-TLDS_TO_CHECK = sorted(list(set([tld if tld.startswith('.') else '.' + tld for tld in TLDS_TO_CHECK])))
+# Ensure unique and sorted TLDs, all starting with a dot. Stored as a tuple since it never changes.
+TLDS_TO_CHECK = tuple(sorted(set(tld if tld.startswith('.') else '.' + tld for tld in TLDS_TO_CHECK)))
+
+OUTPUT_HEADER = (
+    "Original Input Domain", "Base Name Extracted", "TLD Variant Checked", "Full Domain Queried",
+    "DNS Resolves (A/AAAA)", "IP Addresses", "Name Servers (NS)", "Mail Servers (MX)",
+    "WHOIS Creation Date", "WHOIS Updated Date", "WHOIS Expiration Date", "WHOIS Registrar",
+    "WHOIS Domain Status", "WHOIS Registrant Org", "WHOIS Notes/Errors"
+)
+
+# One extractor for the whole run, using the public suffix list bundled with
+# tldextract so no lookup ever waits on a download. No disk cache is needed for
+# the snapshot. Loaded once, here, by a throwaway extraction.
+_TLDX = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+_TLDX("example.com")
+
+# DNS timeout in seconds, passed per query so the shared resolver is never mutated.
+DNS_LIFETIME = 2.5 # Slightly increased timeout
+
+# Public resolvers tried after the system ones, so one slow or lossy system
+# nameserver does not fail thousands of queries. They come last because
+# outbound port 53 is often blocked on corporate networks.
+PUBLIC_NAMESERVERS = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
+
+# One resolver for the whole run; /etc/resolv.conf is only parsed once.
+# Its cache also remembers NXDOMAIN answers, which most TLD variants return.
+_RESOLVER = dns.resolver.Resolver()
+_RESOLVER.nameservers = list(dict.fromkeys(_RESOLVER.nameservers + PUBLIC_NAMESERVERS))
+_RESOLVER.timeout = 1.0 # Per nameserver: move on to the next one well within DNS_LIFETIME
+_RESOLVER.cache = dns.resolver.LRUCache(max_size=20000)
+_RESOLVER.retry_servfail = False # Fail fast on broken servers instead of retrying them
+
+# How many domain variants are checked at the same time. Be polite to servers:
+# lower this if you hit rate limits.
+VARIANT_WORKERS = 16
+# Input domains are processed this many at a time; only one batch of results is held in memory.
+INPUT_CHUNK_SIZE = 16
+# Worker threads for the DNS queries each variant runs side by side (A, AAAA, NS, MX).
+DNS_WORKERS = VARIANT_WORKERS * 4
+_DNS_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=DNS_WORKERS, thread_name_prefix="dns")
+
+# Politeness towards each WHOIS server: at most this many sessions at once, with
+# their starts at least WHOIS_MIN_INTERVAL seconds apart. Variants under different
+# TLDs go to different registries, so they don't share these limits.
+WHOIS_PER_SERVER_CONCURRENCY = 2
+WHOIS_MIN_INTERVAL = 0.5
+
+
+class ServerLimiter:
+    """
+    Context manager limiting requests to a single server from many threads: at most
+    `concurrency` in flight, with starts spaced `min_interval` seconds apart.
+    """
+
+    def __init__(self, concurrency, min_interval):
+        self._sem = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._sem.acquire()
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._min_interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def __exit__(self, *exc_info):
+        self._sem.release()
+
+
+# One limiter per WHOIS server. The registry's WHOIS server is picked by TLD,
+# so the TLD is used as the key.
+_WHOIS_LIMITERS = {}
+
+
+def whois_limiter(domain):
+    tld = domain.rsplit('.', 1)[-1]
+    # setdefault is atomic, so racing threads still end up sharing one limiter
+    return _WHOIS_LIMITERS.setdefault(tld, ServerLimiter(WHOIS_PER_SERVER_CONCURRENCY, WHOIS_MIN_INTERVAL))
+
+
+# WHOIS records are cached on disk between runs; registration data rarely changes.
+# Disable with --no-cache.
+WHOIS_CACHE_FILE = "whois_cache.db"
+WHOIS_CACHE_TTL = 24 * 60 * 60 # seconds
+
+
+class WhoisCache:
+    """
+    Disk-backed cache of parsed WHOIS records, keyed by registered domain.
+    Until open() is called every get() is a miss and put() does nothing.
+    """
+
+    def __init__(self):
+        self._db = None
+        self._lock = threading.Lock() # shelve is not safe to share between threads
+
+    def open(self, path=WHOIS_CACHE_FILE):
+        with self._lock:
+            self._db = shelve.open(path)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get(self, domain):
+        """Returns the cached record dict for domain, or None if missing or expired."""
+        with self._lock:
+            if self._db is None:
+                return None
+            entry = self._db.get(domain)
+            if entry is None:
+                return None
+            expires_at, parsed = entry
+            if expires_at < time.time():
+                del self._db[domain]
+                return None
+            return parsed
+
+    def put(self, domain, parsed, ttl_seconds=WHOIS_CACHE_TTL):
+        with self._lock:
+            if self._db is not None:
+                self._db[domain] = (time.time() + ttl_seconds, parsed)
+
+
+_WHOIS_CACHE = WhoisCache()
+
+# DNS answers are also cached on disk, each for its own record TTL, so re-runs
+# skip the network for records that are still valid. NXDOMAIN and NoAnswer results
+# are kept for the negative TTL from the zone's SOA. Disabled by --no-cache too.
+DNS_CACHE_FILE = "dns_cache.sqlite3"
+# Writes are committed every this many answers, so a killed run keeps most of its work.
+DNS_CACHE_COMMIT_EVERY = 500
+
+
+class DnsCache:
+    """
+    Disk-backed cache of DNS results, keyed by (name, rdtype). A result is either a
+    tuple of rdata text or the name of a negative answer ('NXDOMAIN' or 'NoAnswer').
+    Until open() is called every get() is a miss and put() does nothing. Database
+    errors (e.g. another run holding the file locked) also count as a miss, so the
+    cache can never fail a lookup.
+    """
+
+    def __init__(self):
+        self._db = None
+        self._pending_writes = 0
+        self._lock = threading.Lock() # One connection, shared by the DNS worker threads
+
+    def open(self, path=DNS_CACHE_FILE):
+        with self._lock:
+            try:
+                # Short busy timeout: a locked file should cost a cache miss, not stall every DNS worker
+                self._db = sqlite3.connect(path, timeout=1.0, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS dns_cache ("
+                    "name TEXT NOT NULL, rdtype INTEGER NOT NULL, expires_at REAL NOT NULL, answers TEXT NOT NULL, "
+                    "PRIMARY KEY (name, rdtype))"
+                )
+            except sqlite3.Error as e:
+                print(f"DNS cache unavailable ({e}); continuing without it.")
+                self._db = None
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass # Lost cache entries only cost a re-query next run
+                self._db.close()
+                self._db = None
+
+    def get(self, name, rdtype):
+        """Returns the cached result for name/rdtype, or None if missing or expired."""
+        with self._lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT expires_at, answers FROM dns_cache WHERE name = ? AND rdtype = ?",
+                    (name.lower(), int(rdtype)),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None or row[0] < time.time():
+            return None
+        result = json.loads(row[1])
+        return tuple(result) if isinstance(result, list) else result
+
+    def put(self, name, rdtype, result, ttl_seconds):
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO dns_cache (name, rdtype, expires_at, answers) VALUES (?, ?, ?, ?)",
+                    (name.lower(), int(rdtype), time.time() + ttl_seconds, json.dumps(result)),
+                )
+                self._pending_writes += 1
+                if self._pending_writes >= DNS_CACHE_COMMIT_EVERY:
+                    self._db.commit()
+                    self._pending_writes = 0
+            except sqlite3.Error:
+                pass # Not caching this result only costs a re-query next run
+
+
+_DNS_DISK_CACHE = DnsCache()
 
 
 def extract_meaningful_base(fqdn):
@@ -27,50 +247,141 @@ def extract_meaningful_base(fqdn):
           'example.com' -> 'example'
           'l.vt.com' (if 'com' is suffix) -> 'l.vt'
     """
-    ext = tldextract.extract(fqdn.lower().strip())
+    ext = _TLDX(fqdn.lower().strip())
     if ext.subdomain:
         # If there are multiple levels of subdomains, include them all with the domain
         return f"{ext.subdomain}.{ext.domain}"
     return ext.domain
 
 
+def base_names_to_check(fqdn):
+    """
+    Returns the base names to combine with each TLD: the meaningful base and, if the
+    input has a subdomain, the bare domain as well.
+    e.g., 'sub.example.com' -> ['sub.example', 'example']
+          'example.com' -> ['example']
+    """
+    base_name = extract_meaningful_base(fqdn)
+    if not base_name:
+        return []
+    bare_domain = _TLDX(fqdn.lower().strip()).domain
+    return [name for name in dict.fromkeys((base_name, bare_domain)) if name]
+
+
+def registered_domain(fqdn):
+    """
+    Returns the registrable part of a domain, or '' if there is none.
+    e.g., 'sub.example.co.uk' -> 'example.co.uk'
+    """
+    ext = _TLDX(fqdn.lower().strip())
+    return f"{ext.domain}.{ext.suffix}" if ext.domain and ext.suffix else ""
+
+
+def negative_ttl(response):
+    """
+    Returns how long a negative answer may be cached (RFC 2308: the lesser of the
+    SOA record's TTL and its minimum field), or None if the response has no SOA.
+    """
+    if response is None:
+        return None
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+    return None
+
+
+# Negative results as stored in the DNS cache, and the errors they are raised as again
+_NEGATIVE_RESULTS = {"NXDOMAIN": dns.resolver.NXDOMAIN, "NoAnswer": dns.resolver.NoAnswer}
+
+
+@functools.lru_cache(maxsize=20000)
+def resolve_text(name, rdtype):
+    """
+    Resolves a record type for name and returns the answers as a tuple of strings
+    (rdata.to_text()). Results are memoized for the run and kept in the on-disk
+    cache until their TTL runs out; DNS errors are raised, and NXDOMAIN/NoAnswer
+    are cached on disk as well.
+    """
+    cached = _DNS_DISK_CACHE.get(name, rdtype)
+    if cached in _NEGATIVE_RESULTS:
+        raise _NEGATIVE_RESULTS[cached]()
+    if cached is not None:
+        return cached
+    try:
+        # search=False: query the name exactly as given, never with resolv.conf search suffixes
+        answers = _RESOLVER.resolve(name, rdtype, search=False, lifetime=DNS_LIFETIME)
+    except dns.resolver.NXDOMAIN as e:
+        ttl = negative_ttl(next(iter(e.responses().values()), None))
+        if ttl is not None:
+            _DNS_DISK_CACHE.put(name, rdtype, "NXDOMAIN", ttl)
+        raise
+    except dns.resolver.NoAnswer as e:
+        ttl = negative_ttl(e.kwargs.get('response'))
+        if ttl is not None:
+            _DNS_DISK_CACHE.put(name, rdtype, "NoAnswer", ttl)
+        raise
+    texts = tuple(rdata.to_text() for rdata in answers)
+    _DNS_DISK_CACHE.put(name, rdtype, texts, answers.rrset.ttl)
+    return texts
+
+
+@dataclass(slots=True)
+class VariantResult:
+    """
+    DNS and WHOIS findings for one domain variant. Fields are in OUTPUT_HEADER
+    column order; unknown values stay 'N/A'.
+    """
+    full_domain: str
+    dns_resolves: str = "No"
+    ip_addresses: str = "N/A"
+    name_servers: str = "N/A"
+    mail_servers: str = "N/A"
+    whois_creation_date: str = "N/A"
+    whois_updated_date: str = "N/A"
+    whois_expiration_date: str = "N/A"
+    whois_registrar: str = "N/A"
+    whois_domain_status: str = "N/A"
+    whois_registrant_org: str = "N/A"
+    notes: str = ""
+
+    def to_row(self):
+        return (
+            self.full_domain, self.dns_resolves, self.ip_addresses, self.name_servers, self.mail_servers,
+            self.whois_creation_date, self.whois_updated_date, self.whois_expiration_date,
+            self.whois_registrar, self.whois_domain_status, self.whois_registrant_org, self.notes,
+        )
+
+
 def get_domain_variant_info(domain_variant):
     """
     Gathers DNS and WHOIS information for a given domain variant.
+    Returns a VariantResult.
     """
-    info = {
-        "Full Domain Queried": domain_variant,
-        "DNS Resolves (A/AAAA)": "No",
-        "IP Addresses": "N/A",
-        "Name Servers (NS)": "N/A",
-        "Mail Servers (MX)": "N/A",
-        "WHOIS Creation Date": "N/A",
-        "WHOIS Updated Date": "N/A",
-        "WHOIS Expiration Date": "N/A",
-        "WHOIS Registrar": "N/A",
-        "WHOIS Domain Status": "N/A",
-        "WHOIS Registrant Org": "N/A",
-        "WHOIS Notes/Errors": ""
-    }
+    info = VariantResult(domain_variant)
     dns_errors = []
     whois_errors = []
     dns_resolved_ip = False
     dns_resolved_ns = False
 
-    resolver = dns.resolver.Resolver()
-    resolver.timeout = 2.5 # Slightly increased timeout
-    resolver.lifetime = 2.5
+    # Fire all DNS queries at once; each block below waits only for its own answers.
+    lookups = {rdtype: _DNS_POOL.submit(resolve_text, domain_variant, rdtype)
+               for rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA, dns.rdatatype.NS, dns.rdatatype.MX)}
 
     # 1. Check A/AAAA records (IP Addresses)
     ip_addresses_list = []
     try:
-        for rdtype in [dns.rdatatype.A, dns.rdatatype.AAAA]:
-            answers = resolver.resolve(domain_variant, rdtype)
-            for rdata in answers:
-                ip_addresses_list.append(rdata.to_text())
+        # A missing AAAA record must not hide the A answer
+        first_error = None
+        for lookup in (lookups[dns.rdatatype.A], lookups[dns.rdatatype.AAAA]):
+            try:
+                ip_addresses_list.extend(lookup.result())
+            except Exception as e:
+                first_error = first_error or e
+        if not ip_addresses_list and first_error:
+            raise first_error
         if ip_addresses_list:
-            info["IP Addresses"] = ", ".join(sorted(list(set(ip_addresses_list))))
-            info["DNS Resolves (A/AAAA)"] = "Yes"
+            info.ip_addresses = ", ".join(sorted(set(ip_addresses_list))) # Sorted: resolvers rotate answer order
+            info.dns_resolves = "Yes"
             dns_resolved_ip = True
     except dns.resolver.NXDOMAIN:
         dns_errors.append("DNS NXDOMAIN (IP)")
@@ -84,11 +395,10 @@ def get_domain_variant_info(domain_variant):
     # 2. Check NS records (Name Servers)
     name_servers_list = []
     try:
-        answers = resolver.resolve(domain_variant, dns.rdatatype.NS)
-        for rdata in answers:
-            name_servers_list.append(rdata.target.to_text().rstrip('.'))
+        for target in lookups[dns.rdatatype.NS].result():
+            name_servers_list.append(target.rstrip('.'))
         if name_servers_list:
-            info["Name Servers (NS)"] = ", ".join(sorted(list(set(name_servers_list))))
+            info.name_servers = ", ".join(sorted(set(name_servers_list)))
             dns_resolved_ns = True
     except dns.resolver.NXDOMAIN:
         if not dns_resolved_ip: dns_errors.append("DNS NXDOMAIN (NS)") # Only relevant if IP also NXDOMAIN
@@ -102,13 +412,13 @@ def get_domain_variant_info(domain_variant):
     # 3. Check MX records (Mail Servers)
     mail_servers_list = []
     try:
-        answers = resolver.resolve(domain_variant, dns.rdatatype.MX)
-        for rdata in answers:
-            mail_servers_list.append(f"{rdata.preference} {rdata.exchange.to_text().rstrip('.')}")
+        for mx in lookups[dns.rdatatype.MX].result():
+            preference, exchange = mx.split()
+            mail_servers_list.append(f"{preference} {exchange.rstrip('.')}")
         if mail_servers_list:
             # Sort by preference, then by name
             mail_servers_list.sort(key=lambda x: (int(x.split()[0]), x.split()[1]))
-            info["Mail Servers (MX)"] = ", ".join(mail_servers_list)
+            info.mail_servers = ", ".join(mail_servers_list)
     except dns.resolver.NXDOMAIN:
         if not dns_resolved_ip and not dns_resolved_ns : dns_errors.append("DNS NXDOMAIN (MX)")
     except dns.resolver.NoAnswer:
@@ -119,11 +429,24 @@ def get_domain_variant_info(domain_variant):
         dns_errors.append(f"DNS MX Error: {type(e).__name__}")
 
     # 4. WHOIS Lookup
-    # Proceed if there's any sign of DNS activity or to check availability explicitly
-    if dns_resolved_ip or dns_resolved_ns or not any("NXDOMAIN (IP)" in e and "NXDOMAIN (NS)" in e for e in dns_errors):
+    # NXDOMAIN on every record type means the domain is almost certainly not registered,
+    # so skip the slow WHOIS round trip. Most TLD variants end up here.
+    # Likewise when tldextract finds no registrable domain (e.g. the variant is itself a public suffix).
+    nxdomain_everywhere = {"DNS NXDOMAIN (IP)", "DNS NXDOMAIN (NS)", "DNS NXDOMAIN (MX)"}.issubset(dns_errors)
+    whois_key = registered_domain(domain_variant)
+    if whois_key and not nxdomain_everywhere:
         try:
-            w = whois.whois(domain_variant) # Can be slow
-            if w and (w.domain_name or w.get('domain_name') or w.text): # check if any data was returned
+            w = _WHOIS_CACHE.get(whois_key)
+            if w is None:
+                with whois_limiter(domain_variant):
+                    # Network errors raise instead of coming back as an empty record
+                    entry = whois.whois(domain_variant, ignore_socket_errors=False) # Can be slow
+                # Keep a plain dict (parsed fields plus raw text) so cached and fresh records look the same
+                w = dict(entry, text=entry.text) if entry else None
+                # Only cache records that name a domain; failures and empty replies are retried next run
+                if w and w.get('domain_name'):
+                    _WHOIS_CACHE.put(whois_key, w)
+            if w and (w.get('domain_name') or w.get('text')): # check if any data was returned
 
                 def get_val(data_obj, attr_name, is_list=False, is_date=False):
                     val = None
@@ -136,20 +459,20 @@ def get_domain_variant_info(domain_variant):
                         if isinstance(val, list):
                             if not val: return "N/A"
                             # For dates in list, take the first one. For statuses, join them.
-                            return str(val[0]) if is_date and val else ", ".join(sorted(list(set(str(v).strip() for v in val if v))))
+                            return str(val[0]) if is_date and val else ", ".join(dict.fromkeys(str(v).strip() for v in val if v))
                         return str(val).strip()
                     return "N/A"
 
-                info["WHOIS Creation Date"] = get_val(w, 'creation_date', is_date=True)
-                info["WHOIS Updated Date"] = get_val(w, 'updated_date', is_date=True)
-                info["WHOIS Expiration Date"] = get_val(w, 'expiration_date', is_date=True)
-                info["WHOIS Registrar"] = get_val(w, 'registrar')
-                info["WHOIS Domain Status"] = get_val(w, 'status', is_list=True) # status often a list
+                info.whois_creation_date = get_val(w, 'creation_date', is_date=True)
+                info.whois_updated_date = get_val(w, 'updated_date', is_date=True)
+                info.whois_expiration_date = get_val(w, 'expiration_date', is_date=True)
+                info.whois_registrar = get_val(w, 'registrar')
+                info.whois_domain_status = get_val(w, 'status', is_list=True) # status often a list
 
                 registrant_org = get_val(w, 'org')
                 if registrant_org == "N/A": # Try another common attribute name
                     registrant_org = get_val(w, 'registrant_organization')
-                info["WHOIS Registrant Org"] = registrant_org
+                info.whois_registrant_org = registrant_org
 
                 if (get_val(w, 'domain_name') == "N/A" or not get_val(w, 'domain_name')) and not (dns_resolved_ip or dns_resolved_ns):
                     whois_errors.append("WHOIS data sparse or domain may be available.")
@@ -176,30 +499,94 @@ def get_domain_variant_info(domain_variant):
             whois_errors.append(f"WHOIS AttrError: {str(e)[:50]} (data structure unexpected)")
         except Exception as e:
             whois_errors.append(f"WHOIS General Error: {type(e).__name__} - {str(e)[:50]}")
-    else: # No significant DNS record found (e.g. NXDOMAIN on IP and NS)
-        whois_errors.append("Skipped WHOIS due to DNS indicating non-existence.")
+    elif nxdomain_everywhere:
+        whois_errors.append("Skipped: NXDOMAIN across A/AAAA/NS/MX.")
+    else:
+        whois_errors.append("Skipped: no registrable domain.")
 
 
     all_notes = []
-    if dns_errors: all_notes.append("DNS: " + "; ".join(sorted(list(set(dns_errors)))))
-    if whois_errors: all_notes.append("WHOIS: " + "; ".join(sorted(list(set(whois_errors)))))
-    info["WHOIS Notes/Errors"] = " | ".join(all_notes) if all_notes else "OK"
+    if dns_errors: all_notes.append("DNS: " + "; ".join(dict.fromkeys(dns_errors)))
+    if whois_errors: all_notes.append("WHOIS: " + "; ".join(dict.fromkeys(whois_errors)))
+    info.notes = " | ".join(all_notes) if all_notes else "OK"
 
     return info
 
 
+def check_domains(original_domains, executor):
+    """
+    Yields one output row (in OUTPUT_HEADER order) per input domain, base name and TLD,
+    in input order. Inputs are handled INPUT_CHUNK_SIZE at a time: within a chunk each
+    unique variant is looked up only once, even when several input lines share a base name.
+    """
+    for start in range(0, len(original_domains), INPUT_CHUNK_SIZE):
+        chunk = original_domains[start:start + INPUT_CHUNK_SIZE]
+
+        base_names = []
+        for orig_domain in chunk:
+            bases = base_names_to_check(orig_domain)
+            if not bases:
+                print(f"Warning: Could not extract a valid base name from '{orig_domain}'. Skipping.")
+            base_names.append(bases)
+
+        # Only keep variants that are registrable domains themselves. 'sub.example' + '.com'
+        # is just a subdomain of example.com, so the bare 'example' base covers it instead.
+        variants_by_base = {}
+        for base_name in dict.fromkeys(name for bases in base_names for name in bases):
+            variants_by_base[base_name] = [
+                (tld, base_name + tld) for tld in TLDS_TO_CHECK # tld already includes '.'
+                if registered_domain(base_name + tld) == base_name + tld
+            ]
+        unique_variants = list(dict.fromkeys(
+            domain_variant for variants in variants_by_base.values() for _, domain_variant in variants
+        ))
+        skipped = len(variants_by_base) * len(TLDS_TO_CHECK) - sum(len(v) for v in variants_by_base.values())
+        if skipped:
+            print(f"Skipping {skipped} variants that are not registrable domains.")
+
+        variant_results = {}
+        # Progress is counted per chunk: how many variants survive filtering is only known here
+        chunk_label = f"inputs {start + 1}-{start + len(chunk)} of {len(original_domains)}"
+        # executor.map yields results in input order, while up to VARIANT_WORKERS variants are checked at once
+        results = executor.map(get_domain_variant_info, unique_variants)
+        for query_num, (domain_variant, variant_info) in enumerate(zip(unique_variants, results), 1):
+            print(f"({query_num}/{len(unique_variants)}, {chunk_label}) Checked: {domain_variant}")
+            variant_results[domain_variant] = variant_info
+
+        for orig_domain, bases in zip(chunk, base_names):
+            if not bases:
+                error_row = [""] * len(OUTPUT_HEADER)
+                error_row[0], error_row[1] = orig_domain, "Error"
+                error_row[-1] = "Could not extract base name from input."
+                yield error_row
+                continue
+            if not any(variants_by_base[base_name] for base_name in bases):
+                error_row = [""] * len(OUTPUT_HEADER)
+                error_row[0], error_row[1] = orig_domain, "Error"
+                error_row[-1] = "No registrable TLD variants for this input."
+                yield error_row
+                continue
+
+            for base_name in bases:
+                for tld, domain_variant in variants_by_base[base_name]:
+                    yield (orig_domain, base_name, tld) + variant_results[domain_variant].to_row()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Check a list of domains for registered variants across many TLDs.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Do not read or write the on-disk WHOIS and DNS caches ({WHOIS_CACHE_FILE}, {DNS_CACHE_FILE}).")
+    args = parser.parse_args()
+
+    if not args.no_cache:
+        _WHOIS_CACHE.open()
+        atexit.register(_WHOIS_CACHE.close)
+        _DNS_DISK_CACHE.open()
+        atexit.register(_DNS_DISK_CACHE.close)
+
     input_file = input("Enter the path to your input file (one domain per line): ")
     output_file = input("Enter the path for your output CSV file: ")
 
-    output_header = [
-        "Original Input Domain", "Base Name Extracted", "TLD Variant Checked", "Full Domain Queried",
-        "DNS Resolves (A/AAAA)", "IP Addresses", "Name Servers (NS)", "Mail Servers (MX)",
-        "WHOIS Creation Date", "WHOIS Updated Date", "WHOIS Expiration Date", "WHOIS Registrar",
-        "WHOIS Domain Status", "WHOIS Registrant Org", "WHOIS Notes/Errors"
-    ]
-    results_data = []
-
     try:
         with open(input_file, 'r', encoding='utf-8') as f_in:
             original_domains = [line.strip() for line in f_in if line.strip()]
@@ -215,45 +602,15 @@ def main():
         return
 
     print(f"Found {len(original_domains)} base domains to process from '{input_file}'.")
-    total_variants_to_check = len(original_domains) * len(TLDS_TO_CHECK)
-    print(f"Checking {len(TLDS_TO_CHECK)} TLDs for each, approx. {total_variants_to_check} total queries.")
-    current_query_num = 0
-
-    for orig_domain in original_domains:
-        base_name = extract_meaningful_base(orig_domain)
-        if not base_name:
-            print(f"Warning: Could not extract a valid base name from '{orig_domain}'. Skipping.")
-            results_data.append({
-                "Original Input Domain": orig_domain, "Base Name Extracted": "Error",
-                "WHOIS Notes/Errors": "Could not extract base name from input."
-            })
-            continue
-
-        print(f"\nProcessing base: '{base_name}' (from '{orig_domain}')")
-        for tld in TLDS_TO_CHECK:
-            current_query_num += 1
-            domain_variant_to_check = base_name + tld # tld already includes '.'
-            
-            print(f"({current_query_num}/{total_variants_to_check}) Checking: {domain_variant_to_check}...")
-            
-            variant_info = get_domain_variant_info(domain_variant_to_check)
-            
-            # Prepare row for CSV
-            row = {
-                "Original Input Domain": orig_domain,
-                "Base Name Extracted": base_name,
-                "TLD Variant Checked": tld,
-            }
-            row.update(variant_info) # Add all keys from variant_info
-            results_data.append(row)
-            
-            time.sleep(0.8) # BE POLITE to servers! Increase if you hit rate limits.
+    print(f"Checking up to {len(TLDS_TO_CHECK)} TLDs for each, {INPUT_CHUNK_SIZE} inputs at a time.")
 
     try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f_out:
-            writer = csv.DictWriter(f_out, fieldnames=output_header)
-            writer.writeheader()
-            writer.writerows(results_data)
+        with open(output_file, 'w', newline='', encoding='utf-8') as f_out, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=VARIANT_WORKERS) as executor:
+            writer = csv.writer(f_out)
+            writer.writerow(OUTPUT_HEADER)
+            # Rows are written as each chunk of inputs finishes
+            writer.writerows(check_domains(original_domains, executor))
         print(f"\nSuccessfully wrote all results to '{output_file}'")
     except IOError as e:
         print(f"\nError writing results to output file '{output_file}': {e}")